@@ -1,48 +1,89 @@
 import pyscipopt as ps
 import pathlib
-import numpy as np
+import os
 import itertools
-from typing import List
-
-def is_sorted_subset(subset, superset):
-    i : int = 0
-    try:
-        for a in subset:
-            while superset[i] < a:
-                i += 1
-            if superset[i] == a:
-                continue
-            # a is not in superset.
-            return False
-        return True
-    except IndexError as err:
-        return False
-
-
-def generate_covering_design(lamb : int, v: int, k: int, t: int):
+import functools
+import multiprocessing
+from typing import List, Tuple
+
+def subset_mask(entries) -> int:
+    """Encode a subset of range(v) as an integer bitmask."""
+    mask : int = 0
+    for a in entries:
+        mask |= 1 << a
+    return mask
+
+
+@functools.lru_cache(maxsize=None)
+def subsets(v: int, r: int) -> Tuple[Tuple[int, ...], ...]:
+    """All r-subsets of range(v), in lexicographic order."""
+    return tuple(itertools.combinations(range(v), r=r))
+
+
+@functools.lru_cache(maxsize=None)
+def subset_masks(v: int, r: int) -> Tuple[int, ...]:
+    """Bitmasks of subsets(v, r), in the same order."""
+    return tuple(map(subset_mask, subsets(v, r)))
+
+
+@functools.lru_cache(maxsize=None)
+def covering_subsets(v: int, k: int, t: int) -> Tuple[Tuple[int, ...], ...]:
+    """
+    For every t-subset in subsets(v, t), the sorted indices of the k-subsets in subsets(v, k) containing it.
+    This does not depend on lambda, so all covering designs with the same (v, k, t) share it.
+    """
+    k_index = {k_mask: j for j, k_mask in enumerate(subset_masks(v, k))}
+
+    ret = []
+    for t_mask in subset_masks(v, t):
+        # The k-subsets containing the t-subset are exactly the t-subset extended by
+        # any (k - t)-subset of the remaining elements, so enumerate only those.
+        remaining = [a for a in range(v) if not (t_mask >> a) & 1]
+        ret.append(tuple(sorted(k_index[t_mask | subset_mask(extra)]
+                                for extra in itertools.combinations(remaining, r=k - t))))
+    return tuple(ret)
+
+
+def generate_covering_design(lamb : int, v: int, k: int, t: int, fast_names : bool = False):
     """
     Using IP formulation of Margot 2003
     Small covering designs by branch-and-cut
+
+    With fast_names, variables and constraints are named by index only (x0, cov0, ...)
+    instead of also listing the elements of their subset.
     """
 
     model = ps.Model(problemName=f"cov_{lamb}({v},{k},{t})")
 
-    set_k = list(map(list, itertools.combinations(range(v), r=k)))
-    set_t = list(map(list, itertools.combinations(range(v), r=t)))
+    set_k = subsets(v, k)
+    set_t = subsets(v, t)
 
     x = {
-        j: model.addVar(name=f"x[{j}:{','.join(map(str, entries_k))}]", vtype="I", lb=0.0, ub=float(lamb))
+        j: model.addVar(name=f"x{j}" if fast_names else f"x[{j}:{','.join(map(str, entries_k))}]",
+                        vtype="I", lb=0.0, ub=float(lamb))
         for j, entries_k in enumerate(set_k)
     }
 
-    for i, entries_t in enumerate(set_t):
-        model.addCons(name=f"cov[{i}:{','.join(map(str, entries_t))}]",
-                      cons=ps.quicksum(x[j] for j, entries_k in enumerate(set_k)
-                                       if is_sorted_subset(entries_t, entries_k)) >= lamb)
+    for i, (entries_t, js) in enumerate(zip(set_t, covering_subsets(v, k, t))):
+        name = f"cov{i}" if fast_names else f"cov[{i}:{','.join(map(str, entries_t))}]"
+        model.addCons(name=name,
+                      cons=ps.quicksum(x[j] for j in js) >= lamb)
 
     model.setObjective(ps.quicksum(x.values()), sense="minimize")
     return model
 
+
+def write_covering_designs(v: int, k: int, t: int, jobs: List[Tuple[int, pathlib.Path]]) -> None:
+    """
+    Write the covering design of (v, k, t) for each (lambda, path) in jobs.
+    Grouping the lambdas in one call lets them reuse the cached covering_subsets(v, k, t).
+    """
+    for lamb, writepath in jobs:
+        model : ps.Model = generate_covering_design(lamb, v, k, t)
+        model.writeProblem(writepath)
+        # model.optimize()
+
+
 if __name__ == "__main__":
     output_path = pathlib.Path(__file__).parent / pathlib.Path("instances/")
 
@@ -51,12 +92,10 @@ if __name__ == "__main__":
     lambs = list(range(2, 4))
     vs = ks = ts = list(range(1, 13))
 
-    for lamb, v, k, t in itertools.product(lambs, vs, ks, ts):
-        writepath = output_path / pathlib.Path(f"cov_{lamb}({v},{k},{t}).cip")
-        if writepath.exists():
-            # skip already-generated instances
-            continue
+    existing = {entry.name for entry in os.scandir(output_path)}
 
+    tasks = {}
+    for v, k, t, lamb in itertools.product(vs, ks, ts, lambs):
         # must have v >= k >= t >= 0
         # and cases v = k or k = t are trivial
         if v <= k:
@@ -64,6 +103,13 @@ if __name__ == "__main__":
         if k <= t:
             continue
 
-        model : ps.Model = generate_covering_design(lamb, v, k, t)
-        model.writeProblem(writepath)
-        # model.optimize()
+        filename = f"cov_{lamb}({v},{k},{t}).cip"
+        if filename in existing:
+            # skip already-generated instances
+            continue
+
+        tasks.setdefault((v, k, t), []).append((lamb, output_path / filename))
+
+    # instances are independent, so build and write them in parallel
+    with multiprocessing.Pool() as pool:
+        pool.starmap(write_covering_designs, [(v, k, t, jobs) for (v, k, t), jobs in tasks.items()])
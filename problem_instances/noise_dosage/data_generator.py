@@ -1,6 +1,5 @@
 import pyscipopt as ps
 import pathlib
-import numpy as np
 import itertools
 from typing import List
 import random
@@ -17,34 +16,29 @@ def generate_instance(n_machines, n_workers, worker_hours, seed):
 
     rgen = random.Random(seed)
 
+    def get_random_positive_normals(mean, stdev, size):
+        # We assume that it is normally distributed, but ignore negative results if they happen to pop up.
+        inv_cdf = NormalDist(mu=mean, sigma=stdev).inv_cdf
+        uniform = rgen.random
+
+        ret = []
+        while len(ret) < size:
+            sample = inv_cdf(uniform())
+            if sample >= 0:
+                ret.append(sample)
+        return ret
+
     # number of jobs per machine
     d = [rgen.randint(4, 10) for j in range(n_machines)]
 
     # Job durations.
-    # We assume that it is normally distributed, but ignore negative results if they happen to pop up.
     total_jobs = sum(d)
     mean_job_duration = aimed_total_hours / total_jobs
     stdev_job_duration = mean_job_duration * .2
-    dist = NormalDist(mu=mean_job_duration, sigma=stdev_job_duration)
-
-    def get_random_job_duration():
-        ret = -1.
-        while ret < 0:
-            ret = dist.inv_cdf(rgen.random())
-        return ret
-
-    t = [get_random_job_duration() for j in range(n_machines)]
+    t = get_random_positive_normals(mean_job_duration, stdev_job_duration, n_machines)
 
     # alpha: units of noise
-    dist = NormalDist(mu=18, sigma=4)
-
-    def get_random_noise_dosage():
-        ret = -1.
-        while ret < 0:
-            ret = dist.inv_cdf(rgen.random())
-        return ret
-
-    alpha = [get_random_noise_dosage() for j in range(n_machines)]
+    alpha = get_random_positive_normals(18, 4, n_machines)
 
     inst = NoiseDosage(name, n_machines, n_workers, alpha, d, t, worker_hours)
     return inst
@@ -1,11 +1,11 @@
 import pyscipopt as ps
 import pathlib
-import numpy as np
 import itertools
 from typing import List, IO
 import os
 import argparse
 import math
+import multiprocessing
 
 
 class NoiseDosage:
@@ -42,11 +42,14 @@ class NoiseDosage:
         self.total_hours : int = total_hours
 
     def write(self, fh: IO[str]) -> None:
-        fh.write(f"{self.m} {self.n}" + os.linesep)
-        fh.write(" ".join(map("{:e}".format, self.alpha)) + os.linesep)
-        fh.write(" ".join(map(str, self.d)) + os.linesep)
-        fh.write(" ".join(map("{:e}".format, self.t)) + os.linesep)
-        fh.write(f"{self.total_hours}" + os.linesep)
+        lines = [
+            f"{self.m} {self.n}",
+            " ".join(map("{:e}".format, self.alpha)),
+            " ".join(map(str, self.d)),
+            " ".join(map("{:e}".format, self.t)),
+            f"{self.total_hours}",
+        ]
+        fh.write(os.linesep.join(lines) + os.linesep)
 
 
 def read_noise_dosage(path: pathlib.Path) -> NoiseDosage:
@@ -74,22 +77,23 @@ def generate_noise_dosage(inst : NoiseDosage, with_sherali_smith_symhandling : b
     """
     model = ps.Model(problemName=inst.name)
 
-    x = {
-        (i, j): model.addVar(name=f"x[{i},{j}]", vtype="I", lb=0.0)
+    # x[i, j] is stored at x[i * inst.n + j]
+    x = [
+        model.addVar(name=f"x[{i},{j}]", vtype="I", lb=0.0)
         for i in range(inst.m)
         for j in range(inst.n)
-    }
+    ]
 
     z = model.addVar(name=f"z", vtype="C", lb=0.0)
 
     for j in range(inst.n):
-        model.addCons(z >= ps.quicksum(inst.alpha[i] * x[i, j] for i in range(inst.m)))
+        model.addCons(z >= ps.quicksum(c * v for c, v in zip(inst.alpha, x[j::inst.n])))
 
     for i in range(inst.m):
-        model.addCons(ps.quicksum(x[i, j] for j in range(inst.n)) == inst.d[i])
+        model.addCons(ps.quicksum(x[i * inst.n:(i + 1) * inst.n]) == inst.d[i])
 
     for j in range(inst.n):
-        model.addCons(ps.quicksum(inst.t[i] * x[i, j] for i in range(inst.m)) <= inst.total_hours)
+        model.addCons(ps.quicksum(c * v for c, v in zip(inst.t, x[j::inst.n])) <= inst.total_hours)
 
     if with_sherali_smith_symhandling:
         # for each machine, derive upper bounds of how much one worker can work on it.
@@ -99,16 +103,26 @@ def generate_noise_dosage(inst : NoiseDosage, with_sherali_smith_symhandling : b
         }
         M = max(u.values()) + 1
 
+        powers = [M**i for i in range(inst.m)]
+        # each worker's weighted sum appears in the constraints of both of its neighbours, so build it once
+        weighted = [ps.quicksum(p * v for p, v in zip(powers, x[j::inst.n])) for j in range(inst.n)]
+
         for j in range(inst.n - 1):
-            model.addCons(
-                ps.quicksum(M**i * x[i, j] for i in range(inst.m))
-                >= ps.quicksum(M**i * x[i, j + 1] for i in range(inst.m)))
+            model.addCons(weighted[j] >= weighted[j + 1])
 
     model.setObjective(z, sense="minimize")
 
     return model
 
 
+def write_noise_dosage(path : pathlib.Path, writepath : pathlib.Path,
+                       with_sherali_smith_symhandling : bool = False) -> None:
+    inst : NoiseDosage = read_noise_dosage(path)
+    model : ps.Model = generate_noise_dosage(inst, with_sherali_smith_symhandling=with_sherali_smith_symhandling)
+    model.writeProblem(writepath)
+    # model.optimize()
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(prog="Generate models from data instances")
     parser.add_argument("-d", "--data-dir", default="data/")
@@ -121,6 +135,9 @@ if __name__ == "__main__":
     assert data_path.exists(), f"{data_path} does not exist"
     output_path.mkdir(parents=True, exist_ok=True)
 
+    existing = {entry.name for entry in os.scandir(output_path)}
+
+    tasks = []
     path : pathlib.Path
     for path in data_path.iterdir():
         if path.suffix:
@@ -128,17 +145,16 @@ if __name__ == "__main__":
             continue
 
         # Without Sherali-Smith's symmetry handling constraints
-        writepath = output_path / pathlib.Path(f"{path.stem}.mps")
-        if not writepath.exists():
-            inst : NoiseDosage = read_noise_dosage(path)
-            model : ps.Model = generate_noise_dosage(inst)
-            model.writeProblem(writepath)
-            # model.optimize()
+        filename = f"{path.stem}.mps"
+        if filename not in existing:
+            tasks.append((path, output_path / filename, False))
 
         # With Sherali-Smith's symmetry handling constraints
-        writepath = output_path / pathlib.Path(f"{path.stem}_sym.mps")
-        if not writepath.exists():
-            inst : NoiseDosage = read_noise_dosage(path)
-            model : ps.Model = generate_noise_dosage(inst, with_sherali_smith_symhandling=True)
-            model.writeProblem(writepath)
-            # model.optimize()
+        filename = f"{path.stem}_sym.mps"
+        if filename not in existing:
+            tasks.append((path, output_path / filename, True))
+
+    # Model.writeProblem holds the GIL, so overlap writing with building the next models
+    # by spreading the independent instances over processes rather than threads.
+    with multiprocessing.Pool() as pool:
+        pool.starmap(write_noise_dosage, tasks)
@@ -0,0 +1,14 @@
+#!/bin/bash
+# Generate the problem instances with PyPy, whose JIT speeds up the pure-Python model construction.
+# PySCIPOpt must be installed for the PyPy interpreter; set PYPY to use a different one.
+# Already-generated instances are skipped.
+
+PYPY=${PYPY:-pypy3}
+cd "$(dirname "$0")"
+
+echo "$(date) | Generating covering designs"
+${PYPY} covering_designs/generate.py
+echo "$(date) | Generating noise dosage instances"
+${PYPY} noise_dosage/generate.py --data-dir data/
+${PYPY} noise_dosage/generate.py --data-dir data_generated/
+echo "$(date) | Finished"